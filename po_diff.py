@@ -14,20 +14,41 @@ Shows what changed between two versions:
 """
 
 import argparse
-import gettext
+import functools
 import json
-import locale
+import mmap
 import os
-import re
 import sys
 import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional
 
 __version__ = "1.0.1"
 
+# Optional Rust-based JSON encoder for -f json; stdlib json is the fallback.
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+# Optional Numba-accelerated byte scanner. The JIT path moves the per-line
+# classification loop out of the interpreter; without numba/numpy we fall
+# back to the pure-Python state machine below.
+try:
+    import numpy as _np
+    from numba import njit as _njit
+except ImportError:
+    _np = None
+
 # Translation setup
 DOMAIN = "po-diff"
 
@@ -36,23 +57,52 @@ _possible_locale_dirs = [
     Path("/usr/share/po-diff/locale"),  # Legacy
     Path(__file__).parent / "locale",  # Development
 ]
-LOCALE_DIR = None
-for _dir in _possible_locale_dirs:
-    if _dir.is_dir() and (list(_dir.glob("*/LC_MESSAGES")) or list(_dir.glob("*.pot"))):
-        LOCALE_DIR = _dir
-        break
 
-try:
-    lang = locale.getlocale()[0]
-    if lang:
+
+@functools.lru_cache(maxsize=1)
+def _find_locale_dir():
+    """Locate the catalog directory; probed once, on first translation."""
+    for candidate in _possible_locale_dirs:
+        try:
+            with os.scandir(candidate) as it:
+                for entry in it:
+                    if entry.is_dir() and os.path.isdir(os.path.join(entry.path, 'LC_MESSAGES')):
+                        return candidate
+                    if entry.name.endswith('.pot'):
+                        return candidate
+        except OSError:
+            continue
+    return None
+
+
+_translation = None
+
+
+def _install_gettext():
+    """Import the gettext machinery and load the catalog; runs once, from _()."""
+    import gettext
+    import locale
+
+    try:
+        lang = locale.getlocale()[0]
+        if not lang:  # C/POSIX locale: nothing to translate to
+            return gettext.NullTranslations()
         lang = lang.split('_')[0]
-    if LOCALE_DIR:
-        translation = gettext.translation(DOMAIN, LOCALE_DIR, languages=[lang], fallback=True)
-        _ = translation.gettext
-    else:
-        _ = lambda x: x
-except:
-    _ = lambda x: x
+        locale_dir = _find_locale_dir()
+        if locale_dir:
+            return gettext.translation(DOMAIN, locale_dir,
+                                       languages=[lang], fallback=True)
+    except (ValueError, OSError):
+        pass
+    return gettext.NullTranslations()
+
+
+def _(message):
+    """Translate a message, installing the gettext catalog on first use."""
+    global _translation
+    if _translation is None:
+        _translation = _install_gettext()
+    return _translation.gettext(message)
 
 
 class ChangeType(Enum):
@@ -63,7 +113,12 @@ class ChangeType(Enum):
     FUZZY_REMOVED = "fuzzy_removed"
 
 
-@dataclass
+# Compact tags used for the structure-of-arrays change storage below
+_TYPE_TAGS = {change_type: tag for tag, change_type in enumerate(ChangeType)}
+_TAG_TYPES = tuple(ChangeType)
+
+
+@dataclass(slots=True)
 class Change:
     """Represents a single change between files."""
     change_type: ChangeType
@@ -82,91 +137,379 @@ class Change:
         }
 
 
-@dataclass
+class _ChangeView:
+    """Sequence view over a DiffResult's parallel arrays yielding Change objects."""
+    __slots__ = ('_result',)
+
+    def __init__(self, result):
+        self._result = result
+
+    def __len__(self):
+        return len(self._result.type_tags)
+
+    def __getitem__(self, index):
+        return self._result.change_at(index)
+
+    def __iter__(self):
+        r = self._result
+        for tag, msgid, old, new, line in zip(
+                r.type_tags, r.msgids, r.old_values, r.new_values, r.lines):
+            yield Change(_TAG_TYPES[tag], msgid, old, new, line)
+
+
+@dataclass(slots=True)
 class DiffResult:
-    """Result of comparing two files."""
+    """Result of comparing two files.
+
+    Changes are held as parallel arrays (structure-of-arrays): a byte array
+    of type tags, an int array of line numbers and three string lists.
+    Counting per type is then a C loop over the tag array; `changes` exposes
+    the familiar sequence-of-Change view on top.
+    """
     old_file: str
     new_file: str
-    changes: list = field(default_factory=list)
+    type_tags: array = field(default_factory=lambda: array('B'))
+    lines: array = field(default_factory=lambda: array('i'))
+    msgids: list = field(default_factory=list)
+    old_values: list = field(default_factory=list)
+    new_values: list = field(default_factory=list)
     old_count: int = 0
     new_count: int = 0
-    
+
+    def add_change(self, change_type: ChangeType, msgid: str,
+                   old_value: str = "", new_value: str = "", line: int = 0):
+        """Append one change to the parallel arrays."""
+        self.type_tags.append(_TYPE_TAGS[change_type])
+        self.lines.append(line)
+        self.msgids.append(msgid)
+        self.old_values.append(old_value)
+        self.new_values.append(new_value)
+
+    def change_at(self, index: int) -> Change:
+        return Change(_TAG_TYPES[self.type_tags[index]], self.msgids[index],
+                      self.old_values[index], self.new_values[index],
+                      self.lines[index])
+
+    @property
+    def changes(self):
+        return _ChangeView(self)
+
     @property
     def added_count(self):
-        return sum(1 for c in self.changes if c.change_type == ChangeType.ADDED)
-    
+        return self.type_tags.count(_TYPE_TAGS[ChangeType.ADDED])
+
     @property
     def removed_count(self):
-        return sum(1 for c in self.changes if c.change_type == ChangeType.REMOVED)
-    
+        return self.type_tags.count(_TYPE_TAGS[ChangeType.REMOVED])
+
     @property
     def modified_count(self):
-        return sum(1 for c in self.changes if c.change_type == ChangeType.MODIFIED)
+        return self.type_tags.count(_TYPE_TAGS[ChangeType.MODIFIED])
 
 
-def parse_po_file(filepath: str) -> dict:
-    """Parse a .po file into a dictionary of msgid -> (msgstr, line, fuzzy)."""
+if _np is not None:
+    # Line kinds emitted by the scanner: 1 = msgid, 2 = msgstr,
+    # 3 = quoted continuation, 4 = fuzzy flag comment.
+    @_njit(cache=True)
+    def _scan_po_bytes(buf):
+        n_bytes = buf.size
+        n_lines = 1
+        for i in range(n_bytes):
+            if buf[i] == 10:
+                n_lines += 1
+        kinds = _np.zeros(n_lines, dtype=_np.int8)
+        starts = _np.zeros(n_lines, dtype=_np.int64)
+        ends = _np.zeros(n_lines, dtype=_np.int64)
+        line_nos = _np.zeros(n_lines, dtype=_np.int64)
+        count = 0
+        pos = 0
+        lineno = 0
+        while pos < n_bytes:
+            lineno += 1
+            nl = pos
+            while nl < n_bytes and buf[nl] != 10:
+                nl += 1
+            next_pos = nl + 1
+            while pos < nl and (buf[pos] == 32 or buf[pos] == 9 or buf[pos] == 13):
+                pos += 1
+            if pos == nl:
+                pos = next_pos
+                continue
+            c0 = buf[pos]
+            kind = 0
+            start = 0
+            end = 0
+            if c0 == 35:  # '#'
+                if pos + 1 < nl and buf[pos + 1] == 44:  # '#,'
+                    j = pos
+                    while j + 5 <= nl:  # look for 'fuzzy'
+                        if (buf[j] == 102 and buf[j + 1] == 117 and buf[j + 2] == 122
+                                and buf[j + 3] == 122 and buf[j + 4] == 121):
+                            kind = 4
+                            break
+                        j += 1
+            elif c0 == 109:  # 'm'
+                is_msgid = (pos + 6 <= nl and buf[pos + 1] == 115 and buf[pos + 2] == 103
+                            and buf[pos + 3] == 105 and buf[pos + 4] == 100
+                            and buf[pos + 5] == 32)  # 'msgid '
+                is_msgstr = (not is_msgid and pos + 7 <= nl and buf[pos + 1] == 115
+                             and buf[pos + 2] == 103 and buf[pos + 3] == 115
+                             and buf[pos + 4] == 116 and buf[pos + 5] == 114
+                             and buf[pos + 6] == 32)  # 'msgstr '
+                if is_msgid or is_msgstr:
+                    kind = 1 if is_msgid else 2
+                    q1 = -1
+                    q = pos
+                    while q < nl:
+                        if buf[q] == 34:  # '"'
+                            q1 = q
+                            break
+                        q += 1
+                    q2 = -1
+                    if q1 != -1:
+                        q = nl - 1
+                        while q > q1:
+                            if buf[q] == 34:
+                                q2 = q
+                                break
+                            q -= 1
+                    if q2 > q1:
+                        start = q1 + 1
+                        end = q2
+            elif c0 == 34:  # '"'
+                q2 = -1
+                q = nl - 1
+                while q > pos:
+                    if buf[q] == 34:
+                        q2 = q
+                        break
+                    q -= 1
+                if q2 > pos:
+                    kind = 3
+                    start = pos + 1
+                    end = q2
+            if kind != 0:
+                kinds[count] = kind
+                starts[count] = start
+                ends[count] = end
+                line_nos[count] = lineno
+                count += 1
+            pos = next_pos
+        return kinds, starts, ends, line_nos, count
+
+
+def _map_file(filepath: str):
+    """Map the file read-only; falls back to bytes when mmap is unavailable."""
+    with open(filepath, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty file or mmap-less filesystem
+            return f.read()
+
+
+def _parse_po_file_numba(filepath: str) -> dict:
+    """Numba-backed parser: byte scan in native code, string work in Python."""
+    data = _map_file(filepath)
+    try:
+        return _assemble_entries(data, *_scan_po_bytes(
+            _np.frombuffer(data, dtype=_np.uint8)))
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def _assemble_entries(data, kinds, starts, ends, line_nos, count) -> dict:
+    """Materialize the entries dict from the scanner's span arrays."""
     entries = {}
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Simple PO parser
-    current_msgid = None
-    current_msgstr = None
+    msgid_parts = None
+    msgstr_parts = None
     current_line = 0
     is_fuzzy = False
     in_msgid = False
     in_msgstr = False
-    
-    for i, line in enumerate(content.split('\n'), 1):
-        line_stripped = line.strip()
-        
-        if line_stripped.startswith('#,') and 'fuzzy' in line_stripped:
-            is_fuzzy = True
-            continue
-        
-        if line_stripped.startswith('#'):
-            continue
-        
-        if line_stripped.startswith('msgid '):
-            if current_msgid is not None and current_msgstr is not None:
-                if current_msgid:  # Skip header
-                    entries[current_msgid] = (current_msgstr, current_line, is_fuzzy)
-            
-            match = re.match(r'msgid\s+"(.*)"', line_stripped)
-            current_msgid = match.group(1) if match else ""
-            current_msgstr = None
-            current_line = i
+
+    for i in range(count):
+        kind = kinds[i]
+        if kind == 1:  # msgid
+            if msgid_parts is not None and msgstr_parts is not None:
+                msgid = ''.join(msgid_parts)
+                if msgid:  # Skip header
+                    msgstr = ''.join(msgstr_parts)
+                    entries[sys.intern(msgid)] = (msgstr, current_line, is_fuzzy, hash(msgstr))
+            msgid_parts = [data[starts[i]:ends[i]].decode('utf-8')]
+            msgstr_parts = None
+            current_line = int(line_nos[i])
             in_msgid = True
             in_msgstr = False
             is_fuzzy = False
-            
-        elif line_stripped.startswith('msgstr '):
-            match = re.match(r'msgstr\s+"(.*)"', line_stripped)
-            current_msgstr = match.group(1) if match else ""
+        elif kind == 2:  # msgstr
+            msgstr_parts = [data[starts[i]:ends[i]].decode('utf-8')]
             in_msgid = False
             in_msgstr = True
-            
-        elif line_stripped.startswith('"') and line_stripped.endswith('"'):
-            value = line_stripped[1:-1]
+        elif kind == 3:  # continuation
             if in_msgid:
-                current_msgid += value
+                msgid_parts.append(data[starts[i]:ends[i]].decode('utf-8'))
             elif in_msgstr:
-                current_msgstr += value
-    
+                msgstr_parts.append(data[starts[i]:ends[i]].decode('utf-8'))
+        else:  # fuzzy flag
+            is_fuzzy = True
+
     # Don't forget last entry
-    if current_msgid is not None and current_msgstr is not None:
-        if current_msgid:
-            entries[current_msgid] = (current_msgstr, current_line, is_fuzzy)
+    if msgid_parts is not None and msgstr_parts is not None:
+        msgid = ''.join(msgid_parts)
+        if msgid:
+            msgstr = ''.join(msgstr_parts)
+            entries[sys.intern(msgid)] = (msgstr, current_line, is_fuzzy, hash(msgstr))
+
+    return entries
+
+
+def parse_po_file(filepath: str) -> dict:
+    """Parse a .po file into a dictionary of msgid -> (msgstr, line, fuzzy, msgstr_hash)."""
+    if _np is not None:
+        return _parse_po_file_numba(filepath)
+    return _parse_po_file_py(filepath)
+
+
+def _parse_po_file_py(filepath: str) -> dict:
+    """Pure-Python parser used when numba is not available."""
+    buf = _map_file(filepath)
+    try:
+        return _scan_po_buffer(buf)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+def _scan_po_buffer(buf) -> dict:
+    """State machine over a bytes-like buffer (mmap or bytes).
+
+    Scans the raw bytes directly — no up-front UTF-8 decode of the whole
+    file — dispatching on the first byte of each line and decoding only the
+    quoted payload slices. Multi-line strings accumulate as fragment lists
+    joined once at flush time, avoiding quadratic str += growth.
+    """
+    entries = {}
+    msgid_parts = None
+    msgstr_parts = None
+    current_line = 0
+    is_fuzzy = False
+    in_msgid = False
+    in_msgstr = False
+
+    pos = 0
+    end = len(buf)
+    lineno = 0
+    while pos < end:
+        lineno += 1
+        nl = buf.find(b'\n', pos)
+        if nl == -1:
+            nl = end
+        next_pos = nl + 1
+
+        # Skip leading whitespace (rare in PO files)
+        while pos < nl and buf[pos] in b' \t\r':
+            pos += 1
+        if pos == nl:
+            pos = next_pos
+            continue
+
+        c0 = buf[pos]
+        if c0 == 35:  # '#'
+            if pos + 1 < nl and buf[pos + 1] == 44 and buf.find(b'fuzzy', pos, nl) != -1:
+                is_fuzzy = True
+
+        elif c0 == 109:  # 'm'
+            if buf[pos:pos + 6] == b'msgid ':
+                if msgid_parts is not None and msgstr_parts is not None:
+                    msgid = ''.join(msgid_parts)
+                    if msgid:  # Skip header
+                        msgstr = ''.join(msgstr_parts)
+                        entries[sys.intern(msgid)] = (msgstr, current_line, is_fuzzy, hash(msgstr))
+
+                q1 = buf.find(b'"', pos, nl)
+                q2 = buf.rfind(b'"', q1 + 1, nl) if q1 != -1 else -1
+                msgid_parts = [buf[q1 + 1:q2].decode('utf-8') if q2 > q1 else ""]
+                msgstr_parts = None
+                current_line = lineno
+                in_msgid = True
+                in_msgstr = False
+                is_fuzzy = False
+
+            elif buf[pos:pos + 7] == b'msgstr ':
+                q1 = buf.find(b'"', pos, nl)
+                q2 = buf.rfind(b'"', q1 + 1, nl) if q1 != -1 else -1
+                msgstr_parts = [buf[q1 + 1:q2].decode('utf-8') if q2 > q1 else ""]
+                in_msgid = False
+                in_msgstr = True
+
+        elif c0 == 34:  # '"'
+            q2 = buf.rfind(b'"', pos + 1, nl)
+            if q2 > pos:
+                value = buf[pos + 1:q2].decode('utf-8')
+                if in_msgid:
+                    msgid_parts.append(value)
+                elif in_msgstr:
+                    msgstr_parts.append(value)
+
+        pos = next_pos
     
+    # Don't forget last entry
+    if msgid_parts is not None and msgstr_parts is not None:
+        msgid = ''.join(msgid_parts)
+        if msgid:
+            msgstr = ''.join(msgstr_parts)
+            entries[sys.intern(msgid)] = (msgstr, current_line, is_fuzzy, hash(msgstr))
+
     return entries
 
 
+def parse_ts_file(filepath: str) -> dict:
+    """Parse a Qt .ts file into the same entries dict as parse_po_file.
+
+    Streams <message> elements with ElementTree.iterparse, clearing each one
+    after use so memory stays bounded to a single message. Qt marks entries
+    needing review with type="unfinished" on <translation>, which maps onto
+    the fuzzy flag. The stdlib parser does not expose source lines, so each
+    message gets its 1-based document-order index as the line number — the
+    change ordering in compare_files sorts on it, so it must be distinct
+    and deterministic.
+    """
+    from xml.etree.ElementTree import iterparse
+
+    entries = {}
+    index = 0
+    for _event, elem in iterparse(filepath, events=('end',)):
+        if elem.tag != 'message':
+            continue
+        index += 1
+        source = elem.findtext('source') or ''
+        translation_elem = elem.find('translation')
+        translation = (translation_elem.text or '') if translation_elem is not None else ''
+        fuzzy = (translation_elem is not None
+                 and translation_elem.get('type') == 'unfinished')
+        if source:
+            entries[sys.intern(source)] = (translation, index, fuzzy, hash(translation))
+        elem.clear()
+    return entries
+
+
+def _parse_file(filepath: str) -> dict:
+    """Pick the parser from the file suffix: .ts is Qt XML, anything else PO."""
+    if filepath.lower().endswith('.ts'):
+        return parse_ts_file(filepath)
+    return parse_po_file(filepath)
+
+
 def compare_files(old_path: str, new_path: str) -> DiffResult:
-    """Compare two PO files and return the differences."""
-    old_entries = parse_po_file(old_path)
-    new_entries = parse_po_file(new_path)
+    """Compare two PO or TS files and return the differences."""
+    # Parse both files concurrently; the reads overlap, and the byte-scan
+    # work does too when the numba kernel (which runs without the GIL) is in.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        old_future = executor.submit(_parse_file, old_path)
+        new_future = executor.submit(_parse_file, new_path)
+        old_entries = old_future.result()
+        new_entries = new_future.result()
     
     result = DiffResult(
         old_file=old_path,
@@ -175,53 +518,47 @@ def compare_files(old_path: str, new_path: str) -> DiffResult:
         new_count=len(new_entries)
     )
     
-    # Find added and modified
-    for msgid, (msgstr, line, fuzzy) in new_entries.items():
-        if msgid not in old_entries:
-            result.changes.append(Change(
-                change_type=ChangeType.ADDED,
-                msgid=msgid,
-                new_value=msgstr,
-                line=line
-            ))
-        else:
-            old_msgstr, old_line, old_fuzzy = old_entries[msgid]
-            if msgstr != old_msgstr:
-                result.changes.append(Change(
-                    change_type=ChangeType.MODIFIED,
-                    msgid=msgid,
-                    old_value=old_msgstr,
-                    new_value=msgstr,
-                    line=line
-                ))
-            elif fuzzy and not old_fuzzy:
-                result.changes.append(Change(
-                    change_type=ChangeType.FUZZY_ADDED,
-                    msgid=msgid,
-                    new_value=msgstr,
-                    line=line
-                ))
-            elif not fuzzy and old_fuzzy:
-                result.changes.append(Change(
-                    change_type=ChangeType.FUZZY_REMOVED,
-                    msgid=msgid,
-                    new_value=msgstr,
-                    line=line
-                ))
-    
-    # Find removed
-    for msgid, (msgstr, line, fuzzy) in old_entries.items():
-        if msgid not in new_entries:
-            result.changes.append(Change(
-                change_type=ChangeType.REMOVED,
-                msgid=msgid,
-                old_value=msgstr,
-                line=line
-            ))
-    
+    # Partition the key spaces once with set algebra instead of doing a
+    # membership test per entry inside the loops. Each category is emitted
+    # in line order so the output stays deterministic.
+    old_keys = old_entries.keys()
+    new_keys = new_entries.keys()
+    added = new_keys - old_keys
+    removed = old_keys - new_keys
+    common = new_keys & old_keys
+
+    for msgid in sorted(added, key=lambda m: new_entries[m][1]):
+        msgstr, line, fuzzy, _hash = new_entries[msgid]
+        result.add_change(ChangeType.ADDED, msgid, new_value=msgstr, line=line)
+
+    for msgid in sorted(common, key=lambda m: new_entries[m][1]):
+        msgstr, line, fuzzy, new_hash = new_entries[msgid]
+        old_msgstr, old_line, old_fuzzy, old_hash = old_entries[msgid]
+        # Hashes were precomputed at parse time: unequal hashes prove the
+        # strings differ without touching their bytes; equal hashes fall
+        # back to a full compare.
+        if new_hash != old_hash or msgstr != old_msgstr:
+            result.add_change(ChangeType.MODIFIED, msgid,
+                              old_value=old_msgstr, new_value=msgstr, line=line)
+        elif fuzzy and not old_fuzzy:
+            result.add_change(ChangeType.FUZZY_ADDED, msgid,
+                              new_value=msgstr, line=line)
+        elif not fuzzy and old_fuzzy:
+            result.add_change(ChangeType.FUZZY_REMOVED, msgid,
+                              new_value=msgstr, line=line)
+
+    for msgid in sorted(removed, key=lambda m: old_entries[m][1]):
+        msgstr, line, fuzzy, _hash = old_entries[msgid]
+        result.add_change(ChangeType.REMOVED, msgid, old_value=msgstr, line=line)
+
     return result
 
 
+def _trunc(s: str, limit: int) -> str:
+    """Truncate with an ellipsis only when the string exceeds limit."""
+    return s if len(s) <= limit else s[:limit] + "..."
+
+
 def format_text(result: DiffResult) -> str:
     """Format diff result as text."""
     lines = []
@@ -242,7 +579,11 @@ def format_text(result: DiffResult) -> str:
         lines.append(_("✅ No changes found"))
         return '\n'.join(lines)
     
-    # Group by type
+    # Group change indexes by type tag in one pass over the tag array
+    by_type = {}
+    for i, tag in enumerate(result.type_tags):
+        by_type.setdefault(tag, []).append(i)
+
     for change_type, icon, label in [
         (ChangeType.ADDED, "➕", _("Added")),
         (ChangeType.REMOVED, "➖", _("Removed")),
@@ -250,18 +591,20 @@ def format_text(result: DiffResult) -> str:
         (ChangeType.FUZZY_REMOVED, "✓", _("Fuzzy resolved")),
         (ChangeType.FUZZY_ADDED, "❓", _("Marked fuzzy")),
     ]:
-        changes = [c for c in result.changes if c.change_type == change_type]
-        if changes:
-            lines.append(f"{icon} {label} ({len(changes)})")
+        indexes = by_type.get(_TYPE_TAGS[change_type], [])
+        if indexes:
+            lines.append(f"{icon} {label} ({len(indexes)})")
             lines.append("-" * 40)
-            for c in changes[:20]:  # Limit to 20 per category
-                msgid_short = c.msgid[:50] + "..." if len(c.msgid) > 50 else c.msgid
-                lines.append(f"  [{c.line}] \"{msgid_short}\"")
-                if c.old_value and c.new_value:
-                    lines.append(f"      - {c.old_value[:60]}")
-                    lines.append(f"      + {c.new_value[:60]}")
-            if len(changes) > 20:
-                lines.append(_("      ... and {count} more").format(count=len(changes) - 20))
+            for i in indexes[:20]:  # Limit to 20 per category
+                msgid_short = _trunc(result.msgids[i], 50)
+                lines.append(f"  [{result.lines[i]}] \"{msgid_short}\"")
+                old_value = result.old_values[i]
+                new_value = result.new_values[i]
+                if old_value and new_value:
+                    lines.append(f"      - {old_value[:60]}")
+                    lines.append(f"      + {new_value[:60]}")
+            if len(indexes) > 20:
+                lines.append(_("      ... and {count} more").format(count=len(indexes) - 20))
             lines.append("")
     
     return '\n'.join(lines)
@@ -269,7 +612,7 @@ def format_text(result: DiffResult) -> str:
 
 def format_json(result: DiffResult) -> str:
     """Format diff result as JSON."""
-    return json.dumps({
+    return _json_dumps({
         "old_file": result.old_file,
         "new_file": result.new_file,
         "old_count": result.old_count,
@@ -280,12 +623,19 @@ def format_json(result: DiffResult) -> str:
             "modified": result.modified_count
         },
         "changes": [c.to_dict() for c in result.changes]
-    }, indent=2, ensure_ascii=False)
+    })
+
+
+# Escape table for user-controlled strings in HTML output; str.translate
+# runs the substitution in C.
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
 
 
 def format_html(result: DiffResult) -> str:
     """Format diff result as HTML."""
-    html = f'''<!DOCTYPE html>
+    old_file = result.old_file.translate(_HTML_ESCAPE)
+    new_file = result.new_file.translate(_HTML_ESCAPE)
+    parts = [f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -348,7 +698,7 @@ def format_html(result: DiffResult) -> str:
 <body>
     <div class="container">
         <h1>🔄 po-diff Report</h1>
-        <p><strong>{result.old_file}</strong> → <strong>{result.new_file}</strong></p>
+        <p><strong>{old_file}</strong> → <strong>{new_file}</strong></p>
         <p>Generated: {time.strftime("%Y-%m-%d %H:%M")}</p>
         
         <div class="summary">
@@ -373,40 +723,40 @@ def format_html(result: DiffResult) -> str:
                 <div class="stat-label">Modified</div>
             </div>
         </div>
-'''
-    
+''']
+
     if not result.changes:
-        html += '<p style="color: var(--added); font-size: 1.2em;">✅ No changes found!</p>\n'
+        parts.append('<p style="color: var(--added); font-size: 1.2em;">✅ No changes found!</p>\n')
     else:
-        html += '''
+        parts.append('''
         <h2>📋 All Changes</h2>
         <table>
             <tr><th>Type</th><th>Line</th><th>Message ID</th><th>Old</th><th>New</th></tr>
-'''
-        for c in sorted(result.changes, key=lambda x: x.line):
+''')
+        for c in sorted(result.changes, key=attrgetter('line')):
             type_class = c.change_type.value.replace('_', '-')
-            icon = {"added": "➕", "removed": "➖", "modified": "✏️", 
+            icon = {"added": "➕", "removed": "➖", "modified": "✏️",
                     "fuzzy_added": "❓", "fuzzy_removed": "✓"}.get(c.change_type.value, "•")
-            old_val = c.old_value[:100] + "..." if len(c.old_value) > 100 else c.old_value
-            new_val = c.new_value[:100] + "..." if len(c.new_value) > 100 else c.new_value
-            msgid_short = c.msgid[:80] + "..." if len(c.msgid) > 80 else c.msgid
-            
-            html += f'''            <tr>
+            old_val = _trunc(c.old_value, 100)
+            new_val = _trunc(c.new_value, 100)
+            msgid_short = _trunc(c.msgid, 80)
+
+            parts.append(f'''            <tr>
                 <td class="{type_class}">{icon} {c.change_type.value}</td>
                 <td>{c.line}</td>
-                <td class="msgid">{msgid_short}</td>
-                <td class="diff-old">{old_val}</td>
-                <td class="diff-new">{new_val}</td>
+                <td class="msgid">{msgid_short.translate(_HTML_ESCAPE)}</td>
+                <td class="diff-old">{old_val.translate(_HTML_ESCAPE)}</td>
+                <td class="diff-new">{new_val.translate(_HTML_ESCAPE)}</td>
             </tr>
-'''
-        html += '        </table>\n'
-    
-    html += '''
+''')
+        parts.append('        </table>\n')
+
+    parts.append('''
     </div>
 </body>
-</html>'''
-    
-    return html
+</html>''')
+
+    return ''.join(parts)
 
 
 class TranslatedHelpFormatter(argparse.RawDescriptionHelpFormatter):